@@ -0,0 +1,54 @@
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configuration read once from environment variables at import time.
+    
+    Attributes:
+        aws_region: AWS region for the Lambda client (AWS_REGION)
+        lambda_function_name: Name of the email Lambda function (LAMBDA_FUNCTION_NAME)
+        org_id: Default organization ID (ORG_ID)
+        enable_scheduler: Whether to start the email scheduler on startup (ENABLE_EMAIL_SCHEDULER)
+        interval_minutes: Interval between scheduled emails (EMAIL_SCHEDULE_INTERVAL_MINUTES)
+        sender_email: Default email sender (SENDER_EMAIL)
+        email_to: Default email recipient(s), comma-separated (EMAIL_TO)
+        email_to_list: EMAIL_TO split into individual stripped addresses
+        use_prebook_options_rpc: Fetch options via the get_prebook_options SQL function (USE_PREBOOK_OPTIONS_RPC)
+    """
+    aws_region: str
+    lambda_function_name: Optional[str]
+    org_id: Optional[str]
+    enable_scheduler: bool
+    interval_minutes: int
+    sender_email: Optional[str]
+    email_to: Optional[str]
+    email_to_list: Tuple[str, ...]
+    use_prebook_options_rpc: bool
+    
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from the current environment variables.
+        
+        Returns:
+            Settings instance
+        """
+        email_to = os.environ.get("EMAIL_TO")
+        return cls(
+            aws_region=os.environ.get("AWS_REGION", "us-east-2"),
+            lambda_function_name=os.environ.get("LAMBDA_FUNCTION_NAME"),
+            org_id=os.environ.get("ORG_ID"),
+            enable_scheduler=os.environ.get("ENABLE_EMAIL_SCHEDULER", "false").lower() == "true",
+            interval_minutes=int(os.environ.get("EMAIL_SCHEDULE_INTERVAL_MINUTES", "60")),
+            sender_email=os.environ.get("SENDER_EMAIL"),
+            email_to=email_to,
+            email_to_list=tuple(email.strip() for email in (email_to or "").split(",") if email.strip()),
+            use_prebook_options_rpc=os.environ.get("USE_PREBOOK_OPTIONS_RPC", "false").lower() == "true",
+        )
+
+
+settings = Settings.from_env()
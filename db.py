@@ -1,9 +1,26 @@
+import logging
 import os
-from typing import List, Dict, Any, Union
-from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+from datetime import datetime, time, timezone, timedelta
 from zoneinfo import ZoneInfo
 from supabase import create_client, Client
 
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Timezone objects used for pre-book checks (constructed once at import)
+_CENTRAL_TZ = ZoneInfo("America/Chicago")
+_UTC = timezone.utc
+
+# Current Central time shared by everything handling the same request (see set_now_central)
+_now_central_cv: ContextVar[Optional[datetime]] = ContextVar("now_central", default=None)
+
 
 def get_supabase() -> Client:
     """
@@ -23,10 +40,107 @@ def get_supabase() -> Client:
     if not key:
         raise ValueError("SUPABASE_KEY environment variable is not set")
     
+    return _create_supabase(url, key)
+
+
+@lru_cache(maxsize=1)
+def _create_supabase(url: str, key: str) -> Client:
+    """
+    Create a Supabase client, cached so its HTTP connection pool is reused across calls.
+    
+    Args:
+        url: Supabase project URL
+        key: Supabase API key
+        
+    Returns:
+        Supabase Client instance
+    """
     return create_client(url, key)
 
 
-def is_prebook_load(pickup_date_close: Union[str, datetime, None], origin_state: str | None = None) -> bool:
+def set_now_central(now_central: datetime | None = None) -> Token:
+    """
+    Set the current Central time for the current context (e.g. an HTTP request).
+    
+    Pre-book checks in the same context reuse this value instead of reading the clock.
+    
+    Args:
+        now_central: Current time in Central timezone (defaults to now)
+        
+    Returns:
+        ContextVar token that can be passed to reset_now_central
+    """
+    if now_central is None:
+        now_central = datetime.now(_CENTRAL_TZ)
+    return _now_central_cv.set(now_central)
+
+
+def reset_now_central(token: Token) -> None:
+    """
+    Restore the Central time that was set before set_now_central returned token.
+    
+    Args:
+        token: Token returned by set_now_central
+    """
+    _now_central_cv.reset(token)
+
+
+def get_now_central() -> datetime:
+    """
+    Get the current Central time, preferring the value set for the current context.
+    
+    Returns:
+        Timezone-aware datetime in Central time
+    """
+    now_central = _now_central_cv.get()
+    if now_central is None:
+        now_central = datetime.now(_CENTRAL_TZ)
+    return now_central
+
+
+def _parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO format timestamp, accepting a trailing 'Z' for UTC.
+    
+    Only the trailing character is checked, instead of scanning the whole string
+    with str.replace, since this runs once per load.
+    
+    Args:
+        value: ISO format timestamp string
+        
+    Returns:
+        Parsed datetime
+    """
+    if value.endswith("Z"):
+        return datetime.fromisoformat(value[:-1] + "+00:00")
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=1)
+def _prebook_epoch_bounds(now_central: datetime) -> Tuple[float, float]:
+    """
+    Get the UTC epoch seconds at the start of tomorrow and the day after tomorrow (Central).
+    
+    Cached so a batch of is_prebook_load checks sharing the same now_central only
+    computes the bounds once.
+    
+    Args:
+        now_central: Current time in Central timezone
+        
+    Returns:
+        Tuple of (tomorrow_start_epoch, day_after_tomorrow_start_epoch)
+    """
+    today = now_central.date()
+    tomorrow_start = datetime.combine(today + timedelta(days=1), time(0), tzinfo=_CENTRAL_TZ)
+    day_after_tomorrow_start = datetime.combine(today + timedelta(days=2), time(0), tzinfo=_CENTRAL_TZ)
+    return tomorrow_start.timestamp(), day_after_tomorrow_start.timestamp()
+
+
+def is_prebook_load(
+    pickup_date_close: Union[str, datetime, None],
+    origin_state: str | None = None,
+    now_central: datetime | None = None,
+) -> bool:
     """
     Determine if a load is considered pre-book.
     
@@ -38,6 +152,8 @@ def is_prebook_load(pickup_date_close: Union[str, datetime, None], origin_state:
     Args:
         pickup_date_close: The pickup date close timestamp (ISO format string)
         origin_state: The origin state (not currently used, but kept for future timezone mapping)
+        now_central: Current time in Central timezone (computed if not provided, so callers
+            checking many loads can compute it once per batch)
         
     Returns:
         True if the load is pre-book, False otherwise
@@ -49,20 +165,29 @@ def is_prebook_load(pickup_date_close: Union[str, datetime, None], origin_state:
             
         # Parse the pickup date - handle both datetime objects and strings
         if isinstance(pickup_date_close, str):
-            pickup_dt = datetime.fromisoformat(pickup_date_close.replace('Z', '+00:00'))
+            pickup_dt = _parse_iso_datetime(pickup_date_close)
         else:
             pickup_dt = pickup_date_close
         
         # Ensure pickup_dt is timezone-aware
         if pickup_dt.tzinfo is None:
-            pickup_dt = pickup_dt.replace(tzinfo=timezone.utc)
-        
-        # Convert to Central time
-        central_tz = ZoneInfo("America/Chicago")
-        pickup_central = pickup_dt.astimezone(central_tz)
+            pickup_dt = pickup_dt.replace(tzinfo=_UTC)
         
         # Get current time in Central timezone
-        now_central = datetime.now(central_tz)
+        if now_central is None:
+            now_central = get_now_central()
+        
+        # Fast path: anything before tomorrow (Central) is NOT prebook and anything from
+        # the day after tomorrow onwards is prebook - only tomorrow needs the full check
+        tomorrow_start_epoch, day_after_tomorrow_start_epoch = _prebook_epoch_bounds(now_central)
+        pickup_epoch = pickup_dt.timestamp()
+        if pickup_epoch < tomorrow_start_epoch:
+            return False
+        if pickup_epoch >= day_after_tomorrow_start_epoch:
+            return True
+        
+        # Convert to Central time
+        pickup_central = pickup_dt.astimezone(_CENTRAL_TZ)
         
         # Get dates (without time) for comparison
         pickup_date = pickup_central.date()
@@ -87,25 +212,366 @@ def is_prebook_load(pickup_date_close: Union[str, datetime, None], origin_state:
         return True
         
     except Exception as e:
-        print(f"Error checking prebook status for pickup_date_close={pickup_date_close}: {e}")
+        logger.warning("Error checking prebook status for pickup_date_close=%s: %s", pickup_date_close, e)
         # On error, default to False (not prebook) to be safe
         return False
 
 
+def get_prebook_cutoff(now_central: datetime | None = None) -> datetime:
+    """
+    Get the earliest pickup_date_close (in UTC) that still counts as pre-book.
+    
+    Mirrors is_prebook_load: before noon Central, any pickup from the start of
+    tomorrow onwards is pre-book; from noon onwards, pickups must be at or after
+    9:00 AM Central tomorrow.
+    
+    Args:
+        now_central: Current time in Central timezone (computed if not provided)
+        
+    Returns:
+        Timezone-aware UTC datetime of the pre-book cutoff
+    """
+    if now_central is None:
+        now_central = get_now_central()
+    
+    tomorrow = now_central.date() + timedelta(days=1)
+    cutoff_time = time(9) if now_central.hour >= 12 else time(0)
+    cutoff_central = datetime.combine(tomorrow, cutoff_time, tzinfo=_CENTRAL_TZ)
+    return cutoff_central.astimezone(_UTC)
+
+
+# Max IDs per .in_() filter, keeps PostgREST request URLs well under length limits
+_IN_CHUNK_SIZE = 200
+
+# Load fields copied into each option's "loads" summary (all selected by the loads query)
+_LOAD_SUMMARY_KEYS = itemgetter("id", "status", "org_id", "custom_load_id", "pickup_date_close")
+
+# Loads fetched per request, matches PostgREST's default max-rows so no page is truncated
+_LOADS_PAGE_SIZE = 1000
+
+# Rows fetched per request for each .in_() chunk, for the same reason
+_IN_PAGE_SIZE = 1000
+
+# Rows per get_prebook_options call; max-rows applies to set-returning functions as well
+_OPTIONS_RPC_PAGE_SIZE = 1000
+
+
+def _in_chunked(
+    supabase: Client,
+    table: str,
+    column: str,
+    ids: List[str],
+    select: str,
+    chunk_size: int = _IN_CHUNK_SIZE,
+    order_by: Optional[Tuple[str, ...]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Query rows whose column matches any of the given IDs, splitting the IDs into chunks.
+    
+    Each chunk is paged with .range() like the loads query, since a chunk of IDs can
+    match more rows than PostgREST's max-rows returns in one response.
+    
+    Args:
+        supabase: Supabase client
+        table: Table to query
+        column: Column to filter with .in_()
+        ids: Values to match
+        select: Columns to select
+        chunk_size: Max number of IDs per query
+        order_by: Columns giving a stable row order for paging (defaults to column);
+            should identify a row uniquely, or at least cover every selected column
+        
+    Returns:
+        Combined list of rows from all chunks
+    """
+    rows: List[Dict[str, Any]] = []
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        offset = 0
+        while True:
+            query = supabase.table(table).select(select).in_(column, chunk)
+            for order_column in order_by or (column,):
+                query = query.order(order_column)
+            page = query.range(offset, offset + _IN_PAGE_SIZE - 1).execute().data or []
+            
+            rows.extend(page)
+            if len(page) < _IN_PAGE_SIZE:
+                break
+            offset += _IN_PAGE_SIZE
+    return rows
+
+
+def _fetch_locations_map(supabase: Client, location_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Query locations by ID to get city/state information.
+    
+    Args:
+        supabase: Supabase client
+        location_ids: Location IDs to fetch
+        
+    Returns:
+        Map of location_id -> location record
+    """
+    if not location_ids:
+        return {}
+    
+    locations = _in_chunked(supabase, "locations", "id", location_ids, "id, city, state")
+    return {loc["id"]: loc for loc in locations}
+
+
+def _fetch_options(supabase: Client, load_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Query ALL options for the given loads (no status filter on options).
+    
+    Args:
+        supabase: Supabase client
+        load_ids: Load IDs to fetch options for
+        
+    Returns:
+        List of option records
+    """
+    # Only the columns used for enrichment and the email report are selected
+    # No .eq("status", ...) filter - get ALL options regardless of status
+    return _in_chunked(
+        supabase, "options", "load_id", load_ids, "id, load_id, carrier_id, status, offered_rate, created_at",
+        order_by=("id",),
+    )
+
+
+def _fetch_carriers_map(supabase: Client, carrier_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Query carriers by ID.
+    
+    Args:
+        supabase: Supabase client
+        carrier_ids: Carrier IDs to fetch
+        
+    Returns:
+        Map of carrier_id -> carrier record
+    """
+    if not carrier_ids:
+        return {}
+    
+    carriers = _in_chunked(supabase, "carriers", "id", carrier_ids, "id, name, mc_number, dot_number")
+    return {carrier["id"]: carrier for carrier in carriers}
+
+
+def _fetch_carrier_contacts_map(supabase: Client, carrier_ids: List[str]) -> Dict[str, Any]:
+    """
+    Query carrier contacts for phone numbers.
+    
+    Args:
+        supabase: Supabase client
+        carrier_ids: Carrier IDs to fetch contacts for
+        
+    Returns:
+        Map of carrier_id -> phone
+    """
+    if not carrier_ids:
+        return {}
+    
+    # Contacts have no selected unique key, so order by both columns to keep pages stable
+    carrier_contacts = _in_chunked(
+        supabase, "carrier_contacts", "carrier_id", carrier_ids, "carrier_id, phone",
+        order_by=("carrier_id", "phone"),
+    )
+    return {contact["carrier_id"]: contact.get("phone") for contact in carrier_contacts}
+
+
+def _format_location(location_id: str | None, locations_map: Dict[str, Dict[str, Any]]) -> str | None:
+    """
+    Build a "City, ST" string for a location.
+    
+    Args:
+        location_id: Location ID from the load (may be None)
+        locations_map: Map of location_id -> location record
+        
+    Returns:
+        "City, ST" (or whichever part is present), a "not found" marker if the ID is
+        missing from locations_map, or None if the load has no location ID
+    """
+    if not location_id:
+        return None
+    
+    location = locations_map.get(location_id)
+    if location is None:
+        # Location ID exists but not found in map - might be missing from locations table
+        return f"Location ID: {location_id} (not found)"
+    
+    city = location.get("city")
+    state = location.get("state")
+    if city and state:
+        return city + ", " + state
+    return city or state or ""
+
+
+def _enrich_options(
+    options: List[Dict[str, Any]],
+    loads_map: Dict[str, Dict[str, Any]],
+    locations_map: Dict[str, Dict[str, Any]],
+    carriers_map: Dict[str, Dict[str, Any]],
+    carrier_contacts_map: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Attach enriched load data and carrier info to each option.
+    
+    Args:
+        options: Option records
+        loads_map: Map of load_id -> pre-book load record
+        locations_map: Map of location_id -> location record
+        carriers_map: Map of carrier_id -> carrier record
+        carrier_contacts_map: Map of carrier_id -> phone
+        
+    Yields:
+        Options belonging to a load in loads_map, with "loads", carrier and phone fields attached
+    """
+    # Build enriched load data once per load (many options share the same load)
+    load_enrichment: Dict[str, Dict[str, Any]] = {}
+    for load_id, load in loads_map.items():
+        # Build origin/destination strings from locations_map
+        origin = _format_location(load.get("origin_location_id"), locations_map)
+        destination = _format_location(load.get("destination_location_id"), locations_map)
+        
+        (
+            summary_id,
+            summary_status,
+            summary_org_id,
+            summary_custom_load_id,
+            summary_pickup_date_close,
+        ) = _LOAD_SUMMARY_KEYS(load)
+        load_enrichment[load_id] = {
+            "loads": {
+                "id": summary_id,
+                "status": summary_status,
+                "org_id": summary_org_id,
+                "custom_load_id": summary_custom_load_id,
+                "pickup_date_close": summary_pickup_date_close,
+                "origin": origin,
+                "destination": destination,
+            }
+        }
+    
+    # Attach enriched load data and carrier info to each option
+    for option in options:
+        load_id = option.get("load_id")
+        if load_id in load_enrichment:
+            # Attach enriched load data (shared by all options of the same load)
+            option.update(load_enrichment[load_id])
+            
+            # Get carrier info from carriers_map
+            carrier_id = option.get("carrier_id")
+            carrier_name = None
+            carrier_mc = None
+            carrier_dot = None
+            carrier = carriers_map.get(carrier_id) if carrier_id else None
+            if carrier:
+                carrier_name = carrier.get("name")
+                carrier_mc = carrier.get("mc_number")
+                carrier_dot = carrier.get("dot_number")
+            
+            # Get phone number from carrier_contacts table
+            phone_number = carrier_contacts_map.get(carrier_id) if carrier_id else None
+            # phone_number = option.get("phone")
+            
+            # Attach carrier info directly to option for easier access
+            option["carrier_name"] = carrier_name
+            option["carrier_mc"] = carrier_mc
+            option["carrier_dot"] = carrier_dot
+            option["phone_number"] = phone_number
+            yield option
+
+
+def _get_options_via_rpc(supabase: Client, org_id: str, cutoff: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch pre-book options with their load, locations, carrier and phone in a single call
+    to the get_prebook_options Postgres function (see sql/get_prebook_options.sql).
+    
+    Rows are adapted back into the same maps the table-by-table path builds, so the
+    output shape is identical.
+    
+    Args:
+        supabase: Supabase client
+        org_id: The organization ID to filter by
+        cutoff: Pre-book cutoff (UTC) for pickup_date_close
+        
+    Returns:
+        Iterator of enriched option records
+    """
+    options: List[Dict[str, Any]] = []
+    loads_map: Dict[str, Dict[str, Any]] = {}
+    locations_map: Dict[str, Dict[str, Any]] = {}
+    carriers_map: Dict[str, Dict[str, Any]] = {}
+    carrier_contacts_map: Dict[str, Any] = {}
+    pickup_cutoff = cutoff.isoformat()
+    offset = 0
+    while True:
+        # Paged like the loads query, so PostgREST's max-rows never truncates the result
+        rows = supabase.rpc(
+            "get_prebook_options",
+            {
+                "p_org_id": org_id,
+                "p_pickup_cutoff": pickup_cutoff,
+                "p_limit": _OPTIONS_RPC_PAGE_SIZE,
+                "p_offset": offset,
+            },
+        ).execute().data or []
+        
+        for row in rows:
+            option = row["option"]
+            options.append(option)
+            loads_map[option["load_id"]] = row["load"]
+            for location in (row.get("origin"), row.get("destination")):
+                if location:
+                    locations_map[location["id"]] = location
+            carrier = row.get("carrier")
+            if carrier:
+                carriers_map[carrier["id"]] = carrier
+            # Like the table path, the phone comes from carrier_contacts even if the carrier row is missing
+            carrier_id = option.get("carrier_id")
+            if carrier_id:
+                carrier_contacts_map[carrier_id] = row.get("phone")
+        
+        if len(rows) < _OPTIONS_RPC_PAGE_SIZE:
+            break
+        offset += _OPTIONS_RPC_PAGE_SIZE
+    
+    return _enrich_options(options, loads_map, locations_map, carriers_map, carrier_contacts_map)
+
+
 def get_options_with_available_loads(org_id: str) -> List[Dict[str, Any]]:
+    """
+    Query ALL options for pre-book available loads as a list.
+    
+    See iter_options_with_available_loads, which yields the same options one at a time.
+    
+    Args:
+        org_id: The organization ID to filter by
+        
+    Returns:
+        List of ALL option records (all statuses) with their associated load data
+        for loads that have status='available' and are pre-book
+        
+    Raises:
+        Exception: If the Supabase query fails
+    """
+    return list(iter_options_with_available_loads(org_id))
+
+
+def iter_options_with_available_loads(org_id: str) -> Iterator[Dict[str, Any]]:
     """
     Query ALL options for loads where:
     - Load status is 'available'
     - Load is pre-book (pickup not today, and not tomorrow before 9 AM if current time is after noon)
     - org_id matches
     
-    Returns all options for each matching load, regardless of option status.
+    Yields all options for each matching load, regardless of option status, so callers
+    that only iterate once don't need the full list in memory.
     
     Args:
         org_id: The organization ID to filter by
         
-    Returns:
-        List of ALL option records (all statuses) with their associated load data
+    Yields:
+        ALL option records (all statuses) with their associated load data
         for loads that have status='available' and are pre-book
         
     Raises:
@@ -114,184 +580,85 @@ def get_options_with_available_loads(org_id: str) -> List[Dict[str, Any]]:
     supabase = get_supabase()
     
     try:
-        # First, get loads that match our criteria (status='available' and org_id)
-        loads_result = (
-            supabase.table("loads")
-            .select("id, status, org_id, custom_load_id, pickup_date_close, origin_location_id, destination_location_id")
-            .eq("status", "available")
-            .eq("org_id", org_id)
-            .execute()
-        )
-        
-        if not loads_result.data or len(loads_result.data) == 0:
-            return []
-        
-        # Get origin location IDs for timezone lookup
-        origin_location_ids = [load["origin_location_id"] for load in loads_result.data if load.get("origin_location_id")]
-        dest_location_ids = [load["destination_location_id"] for load in loads_result.data if load.get("destination_location_id")]
-        all_location_ids = list(set(origin_location_ids + dest_location_ids))
-        
-        # Query locations separately to get state information
-        locations_map = {}
-        if all_location_ids:
-            locations_result = (
-                supabase.table("locations")
-                .select("id, city, state")
-                .in_("id", all_location_ids)
-                .execute()
-            )
-            
-            if locations_result.data:
-                locations_map = {loc["id"]: loc for loc in locations_result.data}
-        else:
-            # Debug: if no location IDs found, the loads might not have location references
-            print(f"Warning: No location IDs found in loads. Origin IDs: {len(origin_location_ids)}, Dest IDs: {len(dest_location_ids)}")
+        # Current Central time is computed once for the whole batch
+        now_central = get_now_central()
+        
+        # Optionally do the whole join server-side in one round trip
+        if settings.use_prebook_options_rpc:
+            yield from _get_options_via_rpc(supabase, org_id, get_prebook_cutoff(now_central))
+            return
         
-        # Filter loads to only include pre-book loads
-        prebook_loads = []
-        for load in loads_result.data:
-            pickup_date_close = load.get("pickup_date_close")
-            origin_location_id = load.get("origin_location_id")
+        # Get loads that match our criteria (status='available' and org_id), a page at a time
+        # The pre-book cutoff is applied server-side so non-pre-book loads are never fetched
+        # Single pass over each page: keep pre-book loads (load_id -> load data for quick
+        # lookup) and collect their origin/destination location IDs for the lane strings
+        loads_map: Dict[str, Dict[str, Any]] = {}
+        load_ids: List[str] = []
+        all_location_ids = set()
+        pickup_cutoff = get_prebook_cutoff(now_central).isoformat()
+        offset = 0
+        while True:
+            loads_page = (
+                supabase.table("loads")
+                .select("id, status, org_id, custom_load_id, pickup_date_close, origin_location_id, destination_location_id")
+                .eq("status", "available")
+                .eq("org_id", org_id)
+                .gte("pickup_date_close", pickup_cutoff)
+                .order("id")
+                .range(offset, offset + _LOADS_PAGE_SIZE - 1)
+                .execute()
+            ).data or []
             
-            # Get origin state for timezone (if needed in future)
-            origin_state = None
-            if origin_location_id and origin_location_id in locations_map:
-                origin_state = locations_map[origin_location_id].get("state")
+            for load in loads_page:
+                # Check if load is pre-book
+                if not is_prebook_load(load.get("pickup_date_close"), now_central=now_central):
+                    continue
+                
+                load_id = load["id"]
+                loads_map[load_id] = load
+                load_ids.append(load_id)
+                
+                origin_location_id = load.get("origin_location_id")
+                if origin_location_id:
+                    all_location_ids.add(origin_location_id)
+                dest_location_id = load.get("destination_location_id")
+                if dest_location_id:
+                    all_location_ids.add(dest_location_id)
             
-            # Check if load is pre-book
-            if is_prebook_load(pickup_date_close, origin_state):
-                prebook_loads.append(load)
+            if len(loads_page) < _LOADS_PAGE_SIZE:
+                break
+            offset += _LOADS_PAGE_SIZE
         
-        if not prebook_loads:
-            return []
+        if not loads_map:
+            return
         
-        # Get load IDs for pre-book loads only
-        load_ids = [load["id"] for load in prebook_loads]
+        if not all_location_ids:
+            # Debug: if no location IDs found, the loads might not have location references
+            logger.warning("No location IDs found in %d pre-book load(s)", len(loads_map))
         
-        # Create a map of load_id to load data for quick lookup
-        loads_map = {load["id"]: load for load in prebook_loads}
+        # Locations and options only depend on the loads, so query them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            locations_future = executor.submit(_fetch_locations_map, supabase, list(all_location_ids))
+            options_future = executor.submit(_fetch_options, supabase, load_ids)
+            locations_map = locations_future.result()
+            options = options_future.result()
         
-        # Query ALL options for these loads (no status filter on options)
-        # This gets every option for each available load
-        options_result = (
-            supabase.table("options")
-            .select("*")
-            .in_("load_id", load_ids)
-            # No .eq("status", ...) filter - get ALL options regardless of status
-            .execute()
-        )
-
+        if not options:
+            return
         
+        # Get carrier IDs from options
+        carrier_ids = list({opt["carrier_id"] for opt in options if opt.get("carrier_id")})
         
-        if not options_result.data:
-            return []
+        # Carriers and carrier contacts only depend on the options, so query them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            carriers_future = executor.submit(_fetch_carriers_map, supabase, carrier_ids)
+            contacts_future = executor.submit(_fetch_carrier_contacts_map, supabase, carrier_ids)
+            carriers_map = carriers_future.result()
+            carrier_contacts_map = contacts_future.result()
         
-        # Get carrier IDs from options
-        carrier_ids = [opt.get("carrier_id") for opt in options_result.data if opt.get("carrier_id")]
-        
-        # Query carriers separately
-        carriers_map = {}
-        if carrier_ids:
-            carriers_result = (
-                supabase.table("carriers")
-                .select("id, name, mc_number, dot_number")
-                .in_("id", carrier_ids)
-                .execute()
-            )
-            
-            if carriers_result.data:
-                carriers_map = {carrier["id"]: carrier for carrier in carriers_result.data}
-
-        # Query carrier contacts for phone numbers
-        carrier_contacts_map = {}
-        if carrier_ids:
-            carrier_contacts_phone_result = (
-                supabase.table("carrier_contacts")
-                .select("carrier_id, phone")
-                .in_("carrier_id", carrier_ids)
-                .execute()
-            )
-            
-            # Create a map: carrier_id -> phone
-            if carrier_contacts_phone_result.data:
-                carrier_contacts_map = {
-                    contact["carrier_id"]: contact.get("phone") 
-                    for contact in carrier_contacts_phone_result.data
-                }
-        
-        # Attach enriched load data and carrier info to each option
-        options_list = []
-        for option in options_result.data:
-            load_id = option.get("load_id")
-            created_at = option.get("created_at")
-            if load_id in loads_map:
-                load = loads_map[load_id]
-                
-                # Build origin string from locations_map
-                origin = None
-                origin_location_id = load.get("origin_location_id")
-                if origin_location_id:
-                    if origin_location_id in locations_map:
-                        origin_loc = locations_map[origin_location_id]
-                        origin_city = origin_loc.get("city", "")
-                        origin_state = origin_loc.get("state", "")
-                        origin = f"{origin_city}, {origin_state}".strip(", ")
-                    else:
-                        # Location ID exists but not found in map - might be missing from locations table
-                        origin = f"Location ID: {origin_location_id} (not found)"
-                
-                # Build destination string from locations_map
-                destination = None
-                dest_location_id = load.get("destination_location_id")
-                if dest_location_id:
-                    if dest_location_id in locations_map:
-                        dest_loc = locations_map[dest_location_id]
-                        dest_city = dest_loc.get("city", "")
-                        dest_state = dest_loc.get("state", "")
-                        destination = f"{dest_city}, {dest_state}".strip(", ")
-                    else:
-                        # Location ID exists but not found in map - might be missing from locations table
-                        destination = f"Location ID: {dest_location_id} (not found)"
-                
-                # Get carrier info from carriers_map
-                carrier_id = option.get("carrier_id")
-                carrier_name = None
-                carrier_mc = None
-                carrier_dot = None
-                if carrier_id and carrier_id in carriers_map:
-                    carrier = carriers_map[carrier_id]
-                    carrier_name = carrier.get("name")
-                    carrier_mc = carrier.get("mc_number")
-                    carrier_dot = carrier.get("dot_number")
-                
-                # Get phone number from carrier_contacts table
-                phone_number = carrier_contacts_map.get(carrier_id) if carrier_id else None
-                # phone_number = option.get("phone")
-                
-                # Attach enriched load data to each option
-                option["loads"] = {
-                    "id": load.get("id"),
-                    "status": load.get("status"),
-                    "org_id": load.get("org_id"),
-                    "custom_load_id": load.get("custom_load_id"),
-                    "pickup_date_close": load.get("pickup_date_close"),
-                    "origin": origin,
-                    "destination": destination,
-                }
-                
-                # Attach carrier info directly to option for easier access
-                option["carrier_name"] = carrier_name
-                option["carrier_mc"] = carrier_mc
-                option["carrier_dot"] = carrier_dot
-                option["phone_number"] = phone_number
-                option["created_at"] = created_at
-                options_list.append(option)
-        
-        return options_list
-    except Exception as e:
-        print(f"Error querying options with available loads: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        yield from _enrich_options(options, loads_map, locations_map, carriers_map, carrier_contacts_map)
+    except Exception:
+        logger.exception("Error querying options with available loads")
         raise
 
 
@@ -1,13 +1,71 @@
-import os
 import json
+from html import escape
+import threading
 from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
-from collections import defaultdict
+from itertools import groupby
+from functools import lru_cache
+from operator import itemgetter
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 from botocore.config import Config
 
+from .config import settings
+
+try:
+    from ciso8601 import parse_datetime as _ciso8601_parse_datetime
+except ImportError:
+    _ciso8601_parse_datetime = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Timezone objects used for formatting (constructed once at import)
+_CENTRAL_TZ = ZoneInfo("America/Chicago")
+_UTC = timezone.utc
+
+# Sort key for options with a missing or invalid created_at
+_DT_MIN_UTC = datetime.min.replace(tzinfo=_UTC)
+_DT_MIN_EPOCH = _DT_MIN_UTC.timestamp()
+
+# Translation table deleting every non-digit Latin-1 character, for phone numbers
+_NON_DIGIT_TABLE = str.maketrans({c: None for c in map(chr, range(256)) if not c.isdigit()})
+
+# Keys for the (ordinal, -epoch, row, load, custom_load_id) entries built in _prepare_load_groups
+_GROUP_SORT_KEY = itemgetter(0, 1)
+_ORDINAL_KEY = itemgetter(0)
+
+# Shared Lambda client (see _get_lambda_client)
+_lambda_client = None
+_lambda_client_lock = threading.Lock()
+
+# Largest payload Lambda accepts for an asynchronous "Event" invocation (sync allows 6 MB)
+_LAMBDA_ASYNC_PAYLOAD_LIMIT = 256 * 1024
+
+
+def _parse_iso_timestamp(timestamp: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp string (with or without 'Z').
+    
+    Uses the ciso8601 C parser when installed, otherwise datetime.fromisoformat.
+    
+    Args:
+        timestamp: ISO format string
+        
+    Returns:
+        Parsed datetime (naive if the string has no offset)
+        
+    Raises:
+        ValueError: If the string is not a valid ISO timestamp
+    """
+    if _ciso8601_parse_datetime is not None:
+        return _ciso8601_parse_datetime(timestamp)
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
 
 def format_timestamp(timestamp: Any) -> str:
     """
@@ -19,27 +77,38 @@ def format_timestamp(timestamp: Any) -> str:
     Returns:
         Formatted timestamp string in Central time or 'N/A' if invalid
     """
-    if timestamp is None:
+    # Datetimes are converted to ISO strings so every input shares one hashable cache key
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    elif not isinstance(timestamp, str):
         return 'N/A'
     
+    return _format_timestamp_cached(timestamp)
+
+
+@lru_cache(maxsize=2048)
+def _format_timestamp_cached(timestamp: str) -> str:
+    """
+    Format an ISO timestamp string to a readable string in Central time.
+    
+    Cached because the same created_at values repeat across options and reports.
+    
+    Args:
+        timestamp: ISO string (assumed to be in UTC if it has no offset)
+        
+    Returns:
+        Formatted timestamp string in Central time or 'N/A' if invalid
+    """
     try:
-        # If it's already a datetime object
-        if isinstance(timestamp, datetime):
-            dt = timestamp
-        # If it's a string, parse it
-        elif isinstance(timestamp, str):
-            # Handle ISO format strings (with or without 'Z')
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        else:
-            return 'N/A'
+        # Handle ISO format strings (with or without 'Z')
+        dt = _parse_iso_timestamp(timestamp)
         
         # Ensure datetime is timezone-aware (assume UTC if naive)
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
+            dt = dt.replace(tzinfo=_UTC)
         
         # Convert to Central time
-        central_tz = ZoneInfo("America/Chicago")
-        dt_central = dt.astimezone(central_tz)
+        dt_central = dt.astimezone(_CENTRAL_TZ)
         
         # Format as readable date/time in Central time
         return dt_central.strftime('%Y-%m-%d %H:%M:%S Central')
@@ -60,19 +129,42 @@ def get_timestamp_for_sort(option: Dict[str, Any]) -> datetime:
     """
     created_at_raw = option.get('created_at')
     if created_at_raw is None:
-        return datetime.min.replace(tzinfo=timezone.utc)
+        return _DT_MIN_UTC
     try:
         if isinstance(created_at_raw, datetime):
             dt = created_at_raw
         elif isinstance(created_at_raw, str):
-            dt = datetime.fromisoformat(created_at_raw.replace('Z', '+00:00'))
+            dt = _parse_iso_timestamp(created_at_raw)
         else:
-            return datetime.min.replace(tzinfo=timezone.utc)
+            return _DT_MIN_UTC
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
+            dt = dt.replace(tzinfo=_UTC)
         return dt
     except (ValueError, AttributeError):
-        return datetime.min.replace(tzinfo=timezone.utc)
+        return _DT_MIN_UTC
+
+
+@lru_cache(maxsize=2048)
+def _sort_epoch_cached(timestamp: str) -> float:
+    """
+    Convert an ISO created_at string to epoch seconds for sorting.
+    
+    Cached like _format_timestamp_cached, so each created_at string is parsed for
+    sorting once rather than on every report.
+    
+    Args:
+        timestamp: ISO string (assumed to be in UTC if it has no offset)
+        
+    Returns:
+        Epoch seconds, or the epoch of datetime.min if the string is invalid
+    """
+    try:
+        dt = _parse_iso_timestamp(timestamp)
+    except (ValueError, AttributeError):
+        return _DT_MIN_EPOCH
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_UTC)
+    return dt.timestamp()
 
 
 def format_phone_number(phone: Any) -> str:
@@ -89,12 +181,30 @@ def format_phone_number(phone: Any) -> str:
         return 'N/A'
     
     # Convert to string and remove all non-digit characters
-    phone_str = str(phone).strip()
+    return _format_phone_number_cached(str(phone).strip())
+
+
+@lru_cache(maxsize=2048)
+def _format_phone_number_cached(phone_str: str) -> str:
+    """
+    Format a stripped phone number string to (XXX) XXX-XXXX.
+    
+    Cached because the same carrier phone numbers repeat across options.
+    
+    Args:
+        phone_str: Phone number as a stripped string
+        
+    Returns:
+        Formatted phone number string or 'N/A' if invalid
+    """
     if not phone_str or phone_str == 'N/A':
         return 'N/A'
     
-    # Extract only digits
-    digits = ''.join(filter(str.isdigit, phone_str))
+    # Extract only digits (str.translate deletes non-digit Latin-1 characters in C)
+    digits = phone_str.translate(_NON_DIGIT_TABLE)
+    if not digits.isdigit() and digits:
+        # Rare: characters outside Latin-1 survived the table, filter them the slow way
+        digits = ''.join(filter(str.isdigit, digits))
     
     # Handle different cases
     if len(digits) == 10:
@@ -115,84 +225,74 @@ def format_phone_number(phone: Any) -> str:
         return 'N/A'
 
 
-def format_options_email(options: List[Dict[str, Any]]) -> Tuple[str, str]:
-    """
-    Format options data into an HTML email, grouped by load.
-    
-    Args:
-        options: List of option records with associated load data
-        
-    Returns:
-        Tuple of (subject, html_body)
-    """
-    count = len(options)
-    subject = f"Options Report - {count} Option{'s' if count != 1 else ''} Available"
-    
-    html_body = f"""
+# Static HTML email scaffolding (plain strings, not f-strings, so the CSS needs no escaping)
+_HTML_HEAD = """
     <html>
     <head>
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 line-height: 1.6;
                 color: #333;
-            }}
-            .header {{
+            }
+            .header {
                 background-color: #0066cc;
                 color: white;
                 padding: 20px;
                 text-align: center;
-            }}
-            .content {{
+            }
+            .content {
                 padding: 20px;
-            }}
-            .load-section {{
+            }
+            .load-section {
                 margin-bottom: 30px;
                 border: 1px solid #ddd;
                 border-radius: 5px;
                 overflow: hidden;
-            }}
-            .load-header {{
+            }
+            .load-header {
                 background-color: #0066cc;
                 color: white;
                 padding: 15px 20px;
                 font-size: 18px;
                 font-weight: bold;
-            }}
-            .load-lane {{
+            }
+            .load-lane {
                 background-color: #f0f0f0;
                 padding: 10px 20px;
                 font-size: 14px;
-            }}
-            table {{
+            }
+            table {
                 width: 100%;
                 border-collapse: collapse;
                 margin: 0;
-            }}
-            th, td {{
+            }
+            th, td {
                 border: 1px solid #ddd;
                 padding: 12px;
                 text-align: left;
-            }}
-            th {{
+            }
+            th {
                 background-color: #0066cc;
                 color: white;
-            }}
-            tr:nth-child(even) {{
+            }
+            tr:nth-child(even) {
                 background-color: #f2f2f2;
-            }}
-            .summary {{
+            }
+            .summary {
                 background-color: #e6f3ff;
                 padding: 15px;
                 border-radius: 5px;
                 margin-bottom: 20px;
-            }}
+            }
         </style>
     </head>
     <body>
-        <div class="header">
+"""
+
+_HTML_HEADER_TMPL = """        <div class="header">
             <h1>Options Report</h1>
-            <p>Generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+            <p>Generated at {generated_at}</p>
         </div>
         <div class="content">
             <div class="summary">
@@ -200,32 +300,8 @@ def format_options_email(options: List[Dict[str, Any]]) -> Tuple[str, str]:
                 <p><strong>Total Options:</strong> {count}</p>
             </div>
     """
-    
-    if count > 0:
-        # Group options by load (custom_load_id)
-        loads_dict = defaultdict(list)
-        
-        for option in options:
-            load = option.get('loads', {})
-            if isinstance(load, dict):
-                custom_load_id = load.get('custom_load_id', 'Unknown')
-                loads_dict[custom_load_id].append(option)
-        
-        # Generate HTML for each load group
-        for custom_load_id, load_options in loads_dict.items():
-            # Sort options by created_at descending (most recent first)
-            load_options.sort(key=get_timestamp_for_sort, reverse=True)
-            
-            # Get load info from first option (all options for same load have same load data)
-            first_option = load_options[0]
-            load = first_option.get('loads', {})
-            origin = load.get('origin', 'N/A') if isinstance(load, dict) else 'N/A'
-            destination = load.get('destination', 'N/A') if isinstance(load, dict) else 'N/A'
-            
-            # Build lane string
-            lane = f"{origin} → {destination}" if origin != 'N/A' and destination != 'N/A' else 'N/A'
-            
-            html_body += f"""
+
+_HTML_LOAD_SECTION_TMPL = """
             <div class="load-section">
                 <div class="load-header">
                     Load Number: {custom_load_id}
@@ -245,161 +321,353 @@ def format_options_email(options: List[Dict[str, Any]]) -> Tuple[str, str]:
                     </thead>
                     <tbody>
             """
-            
-            for option in load_options:
-                carrier_mc = option.get('carrier_mc', 'N/A') or 'N/A'
-                carrier_dot = option.get('carrier_dot', 'N/A') or 'N/A'
-                offered_rate = option.get('offered_rate', 'N/A')
-                phone_number_raw = option.get('phone_number', 'N/A') or 'N/A'
-                phone_number = format_phone_number(phone_number_raw)
-                created_at_raw = option.get('created_at')
-                option_logged_time = format_timestamp(created_at_raw)
-                
-                # Format rate
-                rate_display = f"${offered_rate:.2f}" if isinstance(offered_rate, (int, float)) else str(offered_rate)
-                
-                html_body += f"""
+
+_HTML_ROW_TMPL = """
                         <tr>
-                            <td>{carrier_mc}</td>
-                            <td>{carrier_dot}</td>
-                            <td>{rate_display}</td>
-                            <td>{phone_number}</td>
-                            <td>{option_logged_time}</td>
+                            <td>{}</td>
+                            <td>{}</td>
+                            <td>{}</td>
+                            <td>{}</td>
+                            <td>{}</td>
                         </tr>
                 """
-            
-            html_body += """
+
+_HTML_LOAD_SECTION_END = """
                     </tbody>
                 </table>
             </div>
             """
-        
-    else:
-        html_body += """
+
+_HTML_NO_OPTIONS = """
             <p><strong>No options found matching the criteria.</strong></p>
         """
-    
-    html_body += """
+
+_HTML_FOOTER = """
         </div>
     </body>
     </html>
     """
+
+# Everything after _HTML_HEAD for a report with no options
+_HTML_EMPTY_TMPL = _HTML_HEADER_TMPL + _HTML_NO_OPTIONS + _HTML_FOOTER
+
+# Static plain text email scaffolding
+_TEXT_HEADER_TMPL = """OPTIONS REPORT
+Generated at {generated_at}
+
+SUMMARY
+Total Options: {count}
+
+"""
+
+_TEXT_LOAD_SECTION_TMPL = """
+""" + "=" * 60 + """
+LOAD NUMBER: {custom_load_id}
+LANE: {lane}
+""" + "=" * 60 + """
+
+Carrier MC        Carrier DOT      Offer Amount     Phone Number      Option Logged Time
+""" + "─" * 80 + """
+"""
+
+_TEXT_ROW_TMPL = "{:<16} {:<16} {:<16} {:<20} {}\n"
+
+_TEXT_NO_OPTIONS = "No options found matching the criteria.\n"
+
+_TEXT_EMPTY_TMPL = _TEXT_HEADER_TMPL + _TEXT_NO_OPTIONS
+
+
+def _generated_at_now() -> str:
+    """
+    Format the current UTC time for the "Generated at" line of a report.
     
-    return subject, html_body
+    Returns:
+        Timestamp string such as "2025-01-01 12:00:00 UTC"
+    """
+    return datetime.now(_UTC).strftime('%Y-%m-%d %H:%M:%S UTC')
 
 
-def format_options_email_text(options: List[Dict[str, Any]]) -> Tuple[str, str]:
+def _prepare_load_groups(options: List[Dict[str, Any]]) -> List[Tuple[Any, str, List[Tuple[Any, ...]]]]:
     """
-    Format options data into a plain text email, grouped by load.
+    Group options by load and pre-format every row once, for both the HTML and text formatters.
     
     Args:
         options: List of option records with associated load data
         
     Returns:
-        Tuple of (subject, text_body)
+        List of (custom_load_id, lane, rows) in first-seen load order, where each row is
+        (carrier_mc, carrier_dot, rate_display, phone_number, option_logged_time)
+        and rows are sorted by created_at descending (most recent first)
+    """
+    # Bind the per-row helpers locally so the inner loop avoids global lookups
+    _fmt_phone = format_phone_number
+    _fmt_ts = format_timestamp
+    _sort_key = get_timestamp_for_sort
+    _sort_epoch = _sort_epoch_cached
+    _isinstance = isinstance
+    _str = str
+    
+    # Number loads in first-seen order, so a single sort on (load ordinal, -created_at)
+    # both groups the options and orders each group most recent first
+    ordinals = {}
+    keyed_rows = []
+    for option in options:
+        load = option.get('loads', {})
+        if not _isinstance(load, dict):
+            continue
+        custom_load_id = load.get('custom_load_id', 'Unknown')
+        ordinal = ordinals.get(custom_load_id)
+        if ordinal is None:
+            ordinals[custom_load_id] = ordinal = len(ordinals)
+        
+        carrier_mc = option.get('carrier_mc', 'N/A') or 'N/A'
+        carrier_dot = option.get('carrier_dot', 'N/A') or 'N/A'
+        offered_rate = option.get('offered_rate', 'N/A')
+        phone_number_raw = option.get('phone_number', 'N/A') or 'N/A'
+        phone_number = _fmt_phone(phone_number_raw)
+        created_at_raw = option.get('created_at')
+        option_logged_time = _fmt_ts(created_at_raw)
+        
+        # Format rate
+        rate_display = f"${offered_rate:.2f}" if _isinstance(offered_rate, (int, float)) else _str(offered_rate)
+        
+        row = (carrier_mc, carrier_dot, rate_display, phone_number, option_logged_time)
+        
+        # created_at strings share a cached parse; datetimes and missing values take the slow path
+        if _isinstance(created_at_raw, str):
+            epoch = _sort_epoch(created_at_raw)
+        else:
+            epoch = _sort_key(option).timestamp()
+        keyed_rows.append((ordinal, -epoch, row, load, custom_load_id))
+    
+    # Stable sort, so options with equal timestamps keep their input order
+    keyed_rows.sort(key=_GROUP_SORT_KEY)
+    
+    load_groups = []
+    for _, group in groupby(keyed_rows, key=_ORDINAL_KEY):
+        group = list(group)
+        
+        # Get load info from the most recent option (all options for same load have same load data)
+        _, _, _, load, custom_load_id = group[0]
+        origin = load.get('origin', 'N/A')
+        destination = load.get('destination', 'N/A')
+        
+        # Build lane string
+        lane = f"{origin} → {destination}" if origin != 'N/A' and destination != 'N/A' else 'N/A'
+        
+        load_groups.append((custom_load_id, lane, [entry[2] for entry in group]))
+    
+    return load_groups
+
+
+def format_options_email(
+    options: List[Dict[str, Any]],
+    load_groups: Optional[List[Tuple[Any, str, List[Tuple[Any, ...]]]]] = None,
+    generated_at: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    Format options data into an HTML email, grouped by load.
+    
+    Args:
+        options: List of option records with associated load data
+        load_groups: Result of _prepare_load_groups(options), so callers building both the
+            HTML and text bodies only prepare the rows once (computed if not provided)
+        generated_at: Report timestamp for the header, so the HTML and text bodies of one
+            email agree (defaults to _generated_at_now())
+        
+    Returns:
+        Tuple of (subject, html_body)
     """
     count = len(options)
     subject = f"Options Report - {count} Option{'s' if count != 1 else ''} Available"
     
-    text_body = f"""OPTIONS REPORT
-Generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+    if generated_at is None:
+        generated_at = _generated_at_now()
+    
+    if count == 0:
+        # Common on quiet polls: skip the row machinery and fill one precomputed template
+        return subject, _HTML_HEAD + _HTML_EMPTY_TMPL.format(generated_at=generated_at, count=0)
+    
+    parts = [
+        _HTML_HEAD,
+        _HTML_HEADER_TMPL.format(generated_at=generated_at, count=count),
+    ]
+    
+    # Generate HTML for each load group
+    if load_groups is None:
+        load_groups = _prepare_load_groups(options)
+    _esc = escape
+    _str = str
+    _append = parts.append
+    _format_row = _HTML_ROW_TMPL.format
+    for custom_load_id, lane, rows in load_groups:
+        _append(_HTML_LOAD_SECTION_TMPL.format(
+            custom_load_id=_esc(_str(custom_load_id), quote=False),
+            lane=_esc(lane, quote=False),
+        ))
+        
+        # Rate and phone fall back to the raw value when it is not a number / full phone
+        # number, so they are escaped too; only the timestamp (always formatted or 'N/A') is not
+        for carrier_mc, carrier_dot, rate_display, phone_number, option_logged_time in rows:
+            _append(_format_row(
+                _esc(_str(carrier_mc), quote=False),
+                _esc(_str(carrier_dot), quote=False),
+                _esc(rate_display, quote=False),
+                _esc(phone_number, quote=False),
+                option_logged_time,
+            ))
+        
+        _append(_HTML_LOAD_SECTION_END)
+    
+    parts.append(_HTML_FOOTER)
+    
+    return subject, "".join(parts)
 
-SUMMARY
-Total Options: {count}
 
-"""
+def format_options_email_text(
+    options: List[Dict[str, Any]],
+    load_groups: Optional[List[Tuple[Any, str, List[Tuple[Any, ...]]]]] = None,
+    generated_at: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    Format options data into a plain text email, grouped by load.
     
-    if count > 0:
-        # Group options by load (custom_load_id)
-        loads_dict = defaultdict(list)
+    Args:
+        options: List of option records with associated load data
+        load_groups: Result of _prepare_load_groups(options), so callers building both the
+            HTML and text bodies only prepare the rows once (computed if not provided)
+        generated_at: Report timestamp for the header, so the HTML and text bodies of one
+            email agree (defaults to _generated_at_now())
         
-        for option in options:
-            load = option.get('loads', {})
-            if isinstance(load, dict):
-                custom_load_id = load.get('custom_load_id', 'Unknown')
-                loads_dict[custom_load_id].append(option)
+    Returns:
+        Tuple of (subject, text_body)
+    """
+    count = len(options)
+    subject = f"Options Report - {count} Option{'s' if count != 1 else ''} Available"
+    
+    if generated_at is None:
+        generated_at = _generated_at_now()
+    
+    if count == 0:
+        return subject, _TEXT_EMPTY_TMPL.format(generated_at=generated_at, count=0)
+    
+    parts = [_TEXT_HEADER_TMPL.format(generated_at=generated_at, count=count)]
+    
+    # Generate text for each load group
+    if load_groups is None:
+        load_groups = _prepare_load_groups(options)
+    _append = parts.append
+    _format_row = _TEXT_ROW_TMPL.format
+    for custom_load_id, lane, rows in load_groups:
+        _append(_TEXT_LOAD_SECTION_TMPL.format(custom_load_id=custom_load_id, lane=lane))
         
-        # Generate text for each load group
-        for custom_load_id, load_options in loads_dict.items():
-            # Sort options by created_at descending (most recent first)
-            load_options.sort(key=get_timestamp_for_sort, reverse=True)
-            
-            # Get load info from first option (all options for same load have same load data)
-            first_option = load_options[0]
-            load = first_option.get('loads', {})
-            origin = load.get('origin', 'N/A') if isinstance(load, dict) else 'N/A'
-            destination = load.get('destination', 'N/A') if isinstance(load, dict) else 'N/A'
-            
-            # Build lane string
-            lane = f"{origin} → {destination}" if origin != 'N/A' and destination != 'N/A' else 'N/A'
-            
-            text_body += f"""
-{'='*60}
-LOAD NUMBER: {custom_load_id}
-LANE: {lane}
-{'='*60}
+        for row in rows:
+            # Format with fixed-width columns
+            _append(_format_row(*row))
+        
+        _append("\n")
+    
+    return subject, "".join(parts)
 
-Carrier MC        Carrier DOT      Offer Amount     Phone Number      Option Logged Time
-{'─'*80}
-"""
-            
-            for option in load_options:
-                carrier_mc = option.get('carrier_mc', 'N/A') or 'N/A'
-                carrier_dot = option.get('carrier_dot', 'N/A') or 'N/A'
-                offered_rate = option.get('offered_rate', 'N/A')
-                phone_number_raw = option.get('phone_number', 'N/A') or 'N/A'
-                phone_number = format_phone_number(phone_number_raw)
-                created_at_raw = option.get('created_at')
-                option_logged_time = format_timestamp(created_at_raw)
-                
-                # Format rate
-                rate_display = f"${offered_rate:.2f}" if isinstance(offered_rate, (int, float)) else str(offered_rate)
-                
-                # Format with fixed-width columns
-                text_body += f"{carrier_mc:<16} {carrier_dot:<16} {rate_display:<16} {phone_number:<20} {option_logged_time}\n"
-            
-            text_body += "\n"
+
+def _get_lambda_client():
+    """
+    Get the shared boto3 Lambda client, creating it on first use.
+    
+    Creating a client loads credentials and the service model, so one client is reused
+    (boto3 clients are thread-safe) and keeps its HTTP connections alive between sends.
+    
+    Returns:
+        boto3 Lambda client
+    """
+    global _lambda_client
+    
+    if _lambda_client is None:
+        with _lambda_client_lock:
+            if _lambda_client is None:
+                # Disable client-side retries to avoid duplicate invokes
+                _lambda_client = boto3.client(
+                    "lambda",
+                    region_name=settings.aws_region,
+                    config=Config(
+                        retries={"max_attempts": 0, "mode": "standard"}, 
+                        connect_timeout=3, 
+                        read_timeout=10
+                    ),
+                )
+    return _lambda_client
+
+
+def _json_dumps_bytes(data: Any) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, using orjson when installed.
+    
+    Args:
+        data: JSON-serializable data
         
-    else:
-        text_body += "No options found matching the criteria.\n"
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Parse a JSON document from bytes, using orjson when installed.
     
-    return subject, text_body
+    Args:
+        data: JSON document as bytes
+        
+    Returns:
+        Parsed data
+        
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
-def invoke_lambda(payload: dict) -> dict:
+def invoke_lambda(payload: dict, fire_and_forget: bool = False) -> dict:
     """
     Invoke an AWS Lambda function with the given payload.
     
     Args:
         payload: Dictionary payload to send to Lambda function
+        fire_and_forget: Use an asynchronous "Event" invocation that returns once
+            Lambda has queued the request, without waiting for the function to run.
+            Payloads over the async limit fall back to a synchronous invocation
         
     Returns:
-        Dictionary response from Lambda function
+        Dictionary response from Lambda function, or {"statusCode": 202} for a
+        queued fire-and-forget invocation
         
     Raises:
         NoCredentialsError: If AWS credentials are not set
         ClientError: If Lambda invocation fails
     """
     try:
-        # Disable client-side retries to avoid duplicate invokes
-        client = boto3.client(
-            "lambda",
-            region_name=os.environ.get("AWS_REGION", "us-east-2"),
-            config=Config(
-                retries={"max_attempts": 0, "mode": "standard"}, 
-                connect_timeout=3, 
-                read_timeout=10
-            ),
-        )
+        client = _get_lambda_client()
         
-        lambda_function_name = os.environ.get("LAMBDA_FUNCTION_NAME")
+        lambda_function_name = settings.lambda_function_name
         if not lambda_function_name:
             raise ValueError("LAMBDA_FUNCTION_NAME environment variable is not set")
         
+        payload_bytes = _json_dumps_bytes(payload)
+        if fire_and_forget and len(payload_bytes) > _LAMBDA_ASYNC_PAYLOAD_LIMIT:
+            print(
+                f"Lambda payload is {len(payload_bytes)} bytes, over the async limit; "
+                "invoking synchronously instead"
+            )
+            fire_and_forget = False
+        
         resp = client.invoke(
             FunctionName=lambda_function_name,
-            InvocationType="RequestResponse",
-            Payload=json.dumps(payload).encode("utf-8"),
+            InvocationType="Event" if fire_and_forget else "RequestResponse",
+            Payload=payload_bytes,
         )
         
         status_code = resp.get("StatusCode")
@@ -407,22 +675,26 @@ def invoke_lambda(payload: dict) -> dict:
         
         print(f"Lambda invoke StatusCode={status_code} FunctionError={function_error}")
         
-        # Read the payload
-        payload_data = resp["Payload"].read().decode("utf-8")
+        # Event invocations carry no function result, only the 202 Accepted status
+        if fire_and_forget:
+            return {"statusCode": status_code}
+        
+        # Read the payload (raw bytes, parsed without an intermediate decode)
+        payload_data = resp["Payload"].read()
         
         # If Lambda function errored, the payload contains error details
         if function_error:
-            error_data = json.loads(payload_data) if payload_data else {}
+            error_data = _json_loads(payload_data) if payload_data else {}
             error_message = error_data.get("errorMessage", "Unknown Lambda error")
             error_type = error_data.get("errorType", "UnknownError")
             raise RuntimeError(f"Lambda function error ({error_type}): {error_message}")
         
         # Try to parse the response
         try:
-            return json.loads(payload_data)
+            return _json_loads(payload_data)
         except json.JSONDecodeError:
             # If it's not JSON, return the raw response
-            return {"raw_response": payload_data}
+            return {"raw_response": payload_data.decode("utf-8")}
             
     except NoCredentialsError:
         raise ValueError("Missing AWS credentials. Set AWS_ACCESS_KEY_ID/SECRET (and SESSION_TOKEN if temp) and AWS_REGION.")
@@ -434,7 +706,8 @@ def send_options_email(
     options: List[Dict[str, Any]], 
     recipient: Optional[Union[str, List[str]]] = None,
     sender: Optional[str] = None,
-    org_id: Optional[str] = None
+    org_id: Optional[str] = None,
+    fire_and_forget: bool = False
 ) -> Dict[str, Any]:
     """
     Send an email with options data by invoking a Lambda function.
@@ -448,14 +721,16 @@ def send_options_email(
             - Defaults to EMAIL_TO env var (supports comma-separated)
         sender: Email sender (defaults to SENDER_EMAIL env var)
         org_id: Organization ID (required by Lambda function)
+        fire_and_forget: Queue the Lambda invocation and return without waiting for the
+            email to be sent (success then only means the request was accepted)
         
     Returns:
         Dictionary with success status and message/error
     """
     try:
-        recipient_email = recipient or os.environ.get("EMAIL_TO")
-        sender_email = sender or os.environ.get("SENDER_EMAIL")
-        org_id_value = org_id or os.environ.get("ORG_ID")
+        recipient_email = recipient or settings.email_to
+        sender_email = sender or settings.sender_email
+        org_id_value = org_id or settings.org_id
         
         if not recipient_email:
             raise ValueError("EMAIL_TO environment variable is not set")
@@ -465,7 +740,10 @@ def send_options_email(
             raise ValueError("org_id must be provided (either as parameter or ORG_ID env var)")
         
         # Parse recipient_email: support comma-separated emails or list
-        if isinstance(recipient_email, str):
+        if not recipient:
+            # EMAIL_TO was already split once when settings were loaded
+            recipient_list = list(settings.email_to_list)
+        elif isinstance(recipient_email, str):
             # Split by comma and strip whitespace, remove empty strings
             recipient_list = [email.strip() for email in recipient_email.split(",") if email.strip()]
         elif isinstance(recipient_email, list):
@@ -478,7 +756,7 @@ def send_options_email(
         if not recipient_list:
             raise ValueError("No valid email recipients found")
         
-        subject, text_body = format_options_email_text(options)
+        subject, text_body = format_options_email_text(options, generated_at=_generated_at_now())
         
         # Prepare payload for Lambda function
         # The Lambda function expects: orgId (camelCase), to (array), body, from, subject
@@ -491,7 +769,7 @@ def send_options_email(
         }
         
         # Invoke Lambda function to send email
-        lambda_response = invoke_lambda(payload)
+        lambda_response = invoke_lambda(payload, fire_and_forget=fire_and_forget)
         
         # Lambda function should return a response with success/error
         # Adjust based on your Lambda function's response format
@@ -1,17 +1,24 @@
-from typing import Any, Dict, Optional
-import os
+import asyncio
+import logging
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 
-from .db import get_options_with_available_loads
+from .config import settings
+from .db import get_options_with_available_loads, set_now_central, reset_now_central
 from .scheduler import check_cooldown, record_email_sent, start_scheduler, stop_scheduler, is_scheduler_running
 from .email_service import send_options_email
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Organization used when neither the request nor ORG_ID provides one
+DEFAULT_ORG_ID = "01970f4c-c79d-7858-8034-60a265d687e4"
+
 
 async def _send_email_task():
     """
@@ -19,29 +26,27 @@ async def _send_email_task():
     """
     try:
         # Get org_id from environment or use default
-        org_id = os.environ.get("ORG_ID", "01970f4c-c79d-7858-8034-60a265d687e4")
+        org_id = settings.org_id or DEFAULT_ORG_ID
         
-        # Query options
-        options = get_options_with_available_loads(org_id)
+        # Query options (blocking Supabase I/O runs off the event loop)
+        options = await asyncio.to_thread(get_options_with_available_loads, org_id)
         
         # Check cooldown (as safety)
         can_send, reason = check_cooldown()
         if not can_send:
-            print(f"Scheduled email task skipped: {reason}")
+            logger.info("Scheduled email task skipped: %s", reason)
             return
         
-        # Send email
-        email_result = send_options_email(options, org_id=org_id)
+        # Send email (queued asynchronously; the scheduler only logs the outcome)
+        email_result = await asyncio.to_thread(send_options_email, options, org_id=org_id, fire_and_forget=True)
         
         if email_result.get("success"):
-            record_email_sent()
-            print(f"Scheduled email sent successfully with {len(options)} option(s)")
+            await record_email_sent()
+            logger.info("Scheduled email queued successfully with %d option(s)", len(options))
         else:
-            print(f"Scheduled email failed: {email_result.get('error')}")
-    except Exception as e:
-        print(f"Error in scheduled email task: {str(e)}")
-        import traceback
-        traceback.print_exc()
+            logger.warning("Scheduled email failed: %s", email_result.get("error"))
+    except Exception:
+        logger.exception("Error in scheduled email task")
 
 
 @asynccontextmanager
@@ -50,21 +55,20 @@ async def lifespan(app):
     FastAPI lifespan context manager to start/stop scheduler.
     """
     # Startup: Start scheduler if enabled
-    enable_scheduler = os.environ.get("ENABLE_EMAIL_SCHEDULER", "false").lower() == "true"
-    interval_minutes = int(os.environ.get("EMAIL_SCHEDULE_INTERVAL_MINUTES", "60"))
+    interval_minutes = settings.interval_minutes
     
-    if enable_scheduler:
-        print(f"Starting email scheduler with {interval_minutes} minute interval...")
-        start_scheduler(_send_email_task, interval_minutes=interval_minutes)
+    if settings.enable_scheduler:
+        logger.info("Starting email scheduler with %s minute interval...", interval_minutes)
+        await start_scheduler(_send_email_task, interval_minutes=interval_minutes)
     else:
-        print("Email scheduler is disabled (set ENABLE_EMAIL_SCHEDULER=true to enable)")
+        logger.info("Email scheduler is disabled (set ENABLE_EMAIL_SCHEDULER=true to enable)")
     
     yield
     
     # Shutdown: Stop scheduler
     if is_scheduler_running():
-        print("Stopping email scheduler...")
-        stop_scheduler()
+        logger.info("Stopping email scheduler...")
+        await stop_scheduler()
 
 
 class SendEmailRequest(BaseModel):
@@ -72,15 +76,6 @@ class SendEmailRequest(BaseModel):
     org_id: Optional[str] = None
 
 
-def _get_org_id(body: Optional[Dict[str, Any]]) -> str:
-    """Extract org_id from request body or use default."""
-    if body and isinstance(body, dict):
-        org_id = body.get("org_id")
-        if org_id:
-            return org_id
-    return "01970f4c-c79d-7858-8034-60a265d687e4"
-
-
 @router.post("/send-email")
 async def send_email(request: Optional[SendEmailRequest] = None):
     """
@@ -92,13 +87,15 @@ async def send_email(request: Optional[SendEmailRequest] = None):
     Returns:
         JSON response with email result
     """
+    # Share one "now" across all pre-book checks made while handling this request
+    now_token = set_now_central()
     try:
         # Get org_id from request or use default
-        body = request.dict() if request else {}
-        org_id = _get_org_id(body)
+        org_id = (request.org_id if request else None) or DEFAULT_ORG_ID
         
         # Query options - only returns options for pre-book loads with status='available'
-        options = get_options_with_available_loads(org_id)
+        # (run in a worker thread, which inherits the shared "now" via the copied context)
+        options = await asyncio.to_thread(get_options_with_available_loads, org_id)
         
         # Check cooldown
         can_send, reason = check_cooldown()
@@ -114,11 +111,11 @@ async def send_email(request: Optional[SendEmailRequest] = None):
                 }
             )
         
-        # Send email
-        email_result = send_options_email(options, org_id=org_id)
+        # Send email (the Lambda call blocks, so keep it off the event loop)
+        email_result = await asyncio.to_thread(send_options_email, options, org_id=org_id)
         
         if email_result.get("success"):
-            record_email_sent()
+            await record_email_sent()
             return JSONResponse(
                 status_code=200,
                 content={
@@ -153,6 +150,8 @@ async def send_email(request: Optional[SendEmailRequest] = None):
                 "error": str(e)
             }
         )
+    finally:
+        reset_now_central(now_token)
 
 
 @router.post("/webhook")
@@ -204,8 +203,8 @@ async def start_scheduler_endpoint():
             }
         )
     
-    interval_minutes = int(os.environ.get("EMAIL_SCHEDULE_INTERVAL_MINUTES", "60"))
-    success = start_scheduler(_send_email_task, interval_minutes=interval_minutes)
+    interval_minutes = settings.interval_minutes
+    success = await start_scheduler(_send_email_task, interval_minutes=interval_minutes)
     
     if success:
         return JSONResponse(
@@ -220,7 +219,7 @@ async def start_scheduler_endpoint():
             status_code=500,
             content={
                 "status": "error",
-                "message": "Failed to start scheduler. Check if APScheduler is installed."
+                "message": "Failed to start scheduler. Check the server logs for details."
             }
         )
 
@@ -244,7 +243,7 @@ async def stop_scheduler_endpoint():
             }
         )
     
-    stop_scheduler()
+    await stop_scheduler()
     return JSONResponse(
         status_code=200,
         content={
@@ -265,7 +264,7 @@ async def scheduler_status():
     from .scheduler import is_scheduler_running
     
     can_send, reason = check_cooldown()
-    interval_minutes = int(os.environ.get("EMAIL_SCHEDULE_INTERVAL_MINUTES", "60"))
+    interval_minutes = settings.interval_minutes
     
     return JSONResponse(
         status_code=200,
@@ -276,7 +275,7 @@ async def scheduler_status():
                 "can_send": can_send,
                 "reason": reason if not can_send else "Ready to send"
             },
-            "enabled": os.environ.get("ENABLE_EMAIL_SCHEDULER", "false").lower() == "true"
+            "enabled": settings.enable_scheduler
         }
     )
 
@@ -5,10 +5,45 @@ Server startup script for the FastAPI email application.
 This script creates and runs the FastAPI application with the email endpoints.
 """
 
+import asyncio
+import atexit
+import importlib
+import importlib.util
+import logging
 import os
+import queue
 import sys
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from logging.handlers import QueueHandler, QueueListener
+
+
+def _configure_logging() -> None:
+    """
+    Route application log records through a queue to a background thread.
+    
+    Logging calls made on the event loop only enqueue the record; the listener thread
+    does the blocking write to stderr.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    # The queue handler only merges args (and any traceback) into the message; the
+    # listener's handler applies the real format
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_configure_logging()
+logger = logging.getLogger(__name__)
 
 # Add the package to path
 # Since run_server.py is now in the repo root (pepsi-options-emails/),
@@ -16,76 +51,168 @@ from fastapi.middleware.cors import CORSMiddleware
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-# Handle relative imports by temporarily changing directory
-# or by creating a proper package structure
-import importlib.util
+# The repo root is itself the package (its modules use relative imports), but the
+# directory name is not a valid identifier, so register it once as pepsi_options_emails
+# and let the regular import system (and its .pyc cache) load the modules
+package_spec = importlib.util.spec_from_file_location(
+    "pepsi_options_emails",
+    os.path.join(project_root, "__init__.py"),
+    submodule_search_locations=[project_root],
+)
+package = importlib.util.module_from_spec(package_spec)
+sys.modules["pepsi_options_emails"] = package
+package_spec.loader.exec_module(package)
+
+
+async def _load_email_routes(app: FastAPI, stack: AsyncExitStack) -> None:
+    """
+    Import the email modules, add their routes and start the email lifespan.
+    
+    Runs in the background after the server has started, so the port is bound
+    without waiting for Supabase, boto3 and the scheduler to load.
+    
+    Args:
+        app: FastAPI application
+        stack: Exit stack that stops the email lifespan on shutdown
+    """
+    try:
+        # Module imports are blocking, keep them off the event loop
+        main_module = await asyncio.to_thread(importlib.import_module, "pepsi_options_emails.main")
+        app.include_router(main_module.router)
+        await stack.enter_async_context(main_module.lifespan(app))
+        app.state.ready = True
+        logger.info("Email service ready")
+    except Exception:
+        logger.exception("Error loading email service")
 
-# Create a mock package structure for relative imports
-class MockModule:
-    def __init__(self, name):
-        self.__name__ = name
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    FastAPI lifespan context manager that loads the email service in the background.
+    """
+    app.state.ready = False
+    async with AsyncExitStack() as stack:
+        loader = asyncio.create_task(_load_email_routes(app, stack))
         
-# Set up sys.modules for relative imports
-sys.modules['pepsi_options_emails'] = MockModule('pepsi_options_emails')
-
-# Import main module with proper handling of relative imports
-# Modules are in the same directory as run_server.py
-main_path = os.path.join(project_root, "main.py")
-main_spec = importlib.util.spec_from_file_location("pepsi_options_emails.main", main_path)
-main_module = importlib.util.module_from_spec(main_spec)
-
-# Import dependencies and register them in sys.modules for relative imports
-for module_name in ['db', 'scheduler', 'email_service']:
-    module_path = os.path.join(project_root, f"{module_name}.py")
-    spec = importlib.util.spec_from_file_location(f"pepsi_options_emails.{module_name}", module_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[f"pepsi_options_emails.{module_name}"] = module
-    spec.loader.exec_module(module)
-
-# Now load main module
-sys.modules['pepsi_options_emails.main'] = main_module
-main_spec.loader.exec_module(main_module)
-
-router = main_module.router
-lifespan = main_module.lifespan
-
-# Create FastAPI app
-app = FastAPI(
-    title="Pepsi Options Email Service",
-    description="Service that queries options data and sends emails via Lambda",
-    version="1.0.0",
-    lifespan=lifespan
-)
+        yield
+        
+        # Shutdown: stop a load still in progress, then unwind the email lifespan
+        app.state.ready = False
+        loader.cancel()
+        with suppress(asyncio.CancelledError):
+            await loader
 
-# Add CORS middleware (optional, useful for testing)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Include the router
-app.include_router(router)
+def create_app() -> FastAPI:
+    """
+    Create the FastAPI application.
+    
+    Only the health endpoints are registered up front; the email endpoints are added
+    by the lifespan once their modules have loaded (see /health/ready).
+    
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(
+        title="Pepsi Options Email Service",
+        description="Service that queries options data and sends emails via Lambda",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    
+    # Add CORS middleware (optional, useful for testing)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, specify actual origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    @app.get("/health/live")
+    async def health_live():
+        """Liveness check: the process is up and serving requests."""
+        return {"status": "alive"}
+    
+    @app.get("/health/ready")
+    async def health_ready():
+        """Readiness check: the email endpoints are loaded and the scheduler is set up."""
+        if getattr(app.state, "ready", False):
+            return {"status": "ready"}
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
+    from pepsi_options_emails.config import settings
     
     # Get port from environment or use default
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
+    workers = int(os.environ.get("UVICORN_WORKERS", "1"))
+    
+    # Shed load under bursts: past MAX_CONCURRENCY in-flight requests uvicorn answers 503
+    limit_concurrency = int(os.environ.get("MAX_CONCURRENCY", "256"))
+    backlog = int(os.environ.get("BACKLOG", "2048"))
+    
+    # Write the banner in one call so it reaches the log collector as a single write
+    sys.stdout.write("\n".join([
+        f"Starting server on http://{host}:{port} with {workers} worker(s)",
+        f"API docs available at http://{host}:{port}/docs",
+        "",
+        "Available endpoints:",
+        "  GET /health/live - Liveness check",
+        "  GET /health/ready - Readiness check (503 until the email service has loaded)",
+        "  POST /send-email - Send email with options data",
+        "  POST /webhook - Legacy webhook endpoint (same as /send-email)",
+        "  POST / - Root endpoint (same as /send-email)",
+        "  POST /scheduler/start - Start email scheduler",
+        "  POST /scheduler/stop - Stop email scheduler",
+        "  GET /scheduler/status - Get scheduler status",
+        "",
+        "Press CTRL+C to stop the server",
+    ]) + "\n")
+    sys.stdout.flush()
     
-    print(f"Starting server on http://{host}:{port}")
-    print(f"API docs available at http://{host}:{port}/docs")
-    print("\nAvailable endpoints:")
-    print("  POST /send-email - Send email with options data")
-    print("  POST /webhook - Legacy webhook endpoint (same as /send-email)")
-    print("  POST / - Root endpoint (same as /send-email)")
-    print("  POST /scheduler/start - Start email scheduler")
-    print("  POST /scheduler/stop - Stop email scheduler")
-    print("  GET /scheduler/status - Get scheduler status")
-    print("\nPress CTRL+C to stop the server")
-    
-    uvicorn.run(app, host=host, port=port)
+    # Use the C-accelerated event loop and HTTP parser from uvicorn[standard] when available
+    # (uvloop is not available on Windows)
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
+    server_options = dict(
+        host=host,
+        port=port,
+        loop=loop,
+        http=http,
+        limit_concurrency=limit_concurrency,
+        backlog=backlog,
+        timeout_keep_alive=5,
+    )
+    
+    if workers > 1:
+        # Every worker runs the lifespan, so each starts its own scheduler; they only
+        # coordinate through the cooldown file in DATA_DIR
+        if settings.enable_scheduler:
+            logger.warning(
+                "%d workers will each run the email scheduler; keep DATA_DIR on a filesystem shared by all workers",
+                workers,
+            )
+        
+        # Multiple workers need an import string so each process can load the app itself
+        uvicorn.run("run_server:app", workers=workers, **server_options)
+    else:
+        uvicorn.run(app, **server_options)
 
@@ -1,31 +1,58 @@
+import asyncio
+import logging
 import os
 import json
+import time
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Tuple, Optional, Callable
 from pathlib import Path
 
 try:
-    from apscheduler.schedulers.asyncio import AsyncIOScheduler
-    from apscheduler.triggers.interval import IntervalTrigger
-    APSCHEDULER_AVAILABLE = True
+    import orjson
 except ImportError:
-    APSCHEDULER_AVAILABLE = False
-    AsyncIOScheduler = None
-    IntervalTrigger = None
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; writes are still atomic, just not serialized across processes
+    fcntl = None
 
 
+logger = logging.getLogger(__name__)
+
 # Cooldown period in minutes (default: 60 minutes / 1 hour)
 COOLDOWN_MINUTES = int(os.environ.get("EMAIL_COOLDOWN_MINUTES", "60"))
+COOLDOWN_DURATION = timedelta(minutes=COOLDOWN_MINUTES)
+COOLDOWN_SECONDS = COOLDOWN_DURATION.total_seconds()
 
-# Global scheduler instance
-_scheduler: Optional[AsyncIOScheduler] = None
+# Global scheduler task and the event that tells it to stop
+_scheduler_task: Optional[asyncio.Task] = None
+_stop_event: Optional[asyncio.Event] = None
+_running = False
 _send_email_callback: Optional[Callable] = None
 
+# Serializes start/stop so concurrent calls (e.g. two POST /scheduler/start) cannot create two tasks
+_scheduler_lock = asyncio.Lock()
+
+# In-memory copy of the last email sent time (Unix timestamp), and the cooldown file
+# mtime it was last refreshed from; the file is only re-read when that mtime changes
+_last_sent_cache: Optional[float] = None
+_last_sent_mtime_ns: Optional[int] = None
+
+# Unix and time.monotonic() timestamps of the last email sent by this process, if any
+_last_local_sent_epoch: Optional[float] = None
+_last_sent_monotonic: Optional[float] = None
 
+
+@lru_cache(maxsize=1)
 def _get_cooldown_file_path() -> Path:
     """
     Get the path to the file that stores the last email sent timestamp.
     
+    DATA_DIR is read once and the path cached, since it does not change while running.
+    
     Returns:
         Path object to the cooldown file
     """
@@ -35,12 +62,42 @@ def _get_cooldown_file_path() -> Path:
     return cooldown_file
 
 
-def _get_last_email_timestamp() -> datetime | None:
+def _get_last_email_epoch() -> Optional[float]:
     """
-    Read the last email sent timestamp from the cooldown file.
+    Get the last email sent time, re-reading the cooldown file only when it has changed.
+    
+    Costs one stat per call; the file is read again only when its mtime changes, which
+    picks up emails recorded by other workers. The later of the file and in-memory
+    values wins, so a read racing this process's own pending write cannot go backwards.
     
     Returns:
-        datetime object of last email sent, or None if no record exists
+        Unix timestamp of the last email sent, or None if no record exists
+    """
+    global _last_sent_cache, _last_sent_mtime_ns
+    
+    try:
+        mtime_ns = _get_cooldown_file_path().stat().st_mtime_ns
+    except OSError:
+        # No cooldown file yet
+        return _last_sent_cache
+    
+    if mtime_ns != _last_sent_mtime_ns:
+        _last_sent_mtime_ns = mtime_ns
+        file_epoch = _read_last_email_epoch()
+        if file_epoch is not None and (_last_sent_cache is None or file_epoch > _last_sent_cache):
+            _last_sent_cache = file_epoch
+    return _last_sent_cache
+
+
+def _read_last_email_epoch() -> Optional[float]:
+    """
+    Read the last email sent time from the cooldown file.
+    
+    Files written before the epoch field was added only have the ISO "last_email_sent"
+    string, which is still accepted.
+    
+    Returns:
+        Unix timestamp of the last email sent, or None if no record exists
     """
     cooldown_file = _get_cooldown_file_path()
     
@@ -48,24 +105,36 @@ def _get_last_email_timestamp() -> datetime | None:
         return None
     
     try:
-        with open(cooldown_file, "r") as f:
-            data = json.load(f)
+        with open(cooldown_file, "rb") as f:
+            raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            epoch = data.get("last_email_sent_epoch")
+            if isinstance(epoch, (int, float)):
+                return float(epoch)
             timestamp_str = data.get("last_email_sent")
             if timestamp_str:
-                return datetime.fromisoformat(timestamp_str)
+                last_email = datetime.fromisoformat(timestamp_str)
+                # Ensure last_email is timezone-aware
+                if last_email.tzinfo is None:
+                    last_email = last_email.replace(tzinfo=timezone.utc)
+                return last_email.timestamp()
     except (json.JSONDecodeError, ValueError, KeyError, IOError) as e:
-        print(f"Error reading cooldown file: {e}")
+        logger.warning("Error reading cooldown file: %s", e)
         return None
     
     return None
 
 
-def _save_email_timestamp(timestamp: datetime) -> None:
+def _save_last_email_epoch(epoch: float) -> None:
     """
-    Save the email sent timestamp to the cooldown file.
+    Save the email sent time to the cooldown file.
+    
+    The file is written to a temporary file and moved into place with os.replace, so a
+    crash mid-write never leaves a truncated cooldown file. An exclusive lock on a
+    sibling .lock file keeps concurrent workers from interleaving their writes.
     
     Args:
-        timestamp: datetime object representing when the email was sent
+        epoch: Unix timestamp of when the email was sent
     """
     cooldown_file = _get_cooldown_file_path()
     
@@ -73,15 +142,21 @@ def _save_email_timestamp(timestamp: datetime) -> None:
         # Ensure directory exists
         cooldown_file.parent.mkdir(parents=True, exist_ok=True)
         
-        data = {
-            "last_email_sent": timestamp.isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }
+        # Compact output: the file is only ever read back by this module
+        data = {"last_email_sent_epoch": epoch}
+        content = orjson.dumps(data) if orjson is not None else json.dumps(data).encode("utf-8")
         
-        with open(cooldown_file, "w") as f:
-            json.dump(data, f, indent=2)
+        tmp_file = cooldown_file.with_suffix(".json.tmp")
+        with open(cooldown_file.with_suffix(".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            with open(tmp_file, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, cooldown_file)
     except IOError as e:
-        print(f"Error saving cooldown file: {e}")
+        logger.warning("Error saving cooldown file: %s", e)
         # Don't raise - this shouldn't block email sending
 
 
@@ -94,39 +169,43 @@ def check_cooldown() -> Tuple[bool, str]:
         - If can_send is True, reason will be empty string
         - If can_send is False, reason will explain why
     """
-    last_email = _get_last_email_timestamp()
+    last_epoch = _get_last_email_epoch()
     
-    if last_email is None:
+    if last_epoch is None:
         # No previous email recorded, so we can send
         return True, ""
     
-    # Ensure last_email is timezone-aware
-    if last_email.tzinfo is None:
-        last_email = last_email.replace(tzinfo=timezone.utc)
-    
-    # Get current time (timezone-aware)
-    now = datetime.now(timezone.utc)
+    # Calculate seconds since last email, on the monotonic clock when this process sent
+    # the latest one (immune to wall-clock changes); otherwise from the recorded Unix timestamp
+    if _last_sent_monotonic is not None and last_epoch == _last_local_sent_epoch:
+        seconds_since_last = time.monotonic() - _last_sent_monotonic
+    else:
+        seconds_since_last = time.time() - last_epoch
     
-    # Calculate time since last email
-    time_since_last = now - last_email
-    cooldown_duration = timedelta(minutes=COOLDOWN_MINUTES)
-    
-    # if time_since_last < cooldown_duration:
+    # if seconds_since_last < COOLDOWN_SECONDS:
     #     # Still in cooldown period
-    #     remaining_minutes = (cooldown_duration - time_since_last).total_seconds() / 60
+    #     remaining_minutes = (COOLDOWN_SECONDS - seconds_since_last) / 60
     #     return False, f"Cooldown period active. {remaining_minutes:.1f} minutes remaining."
     
     # Cooldown period has passed, can send
     return True, ""
 
 
-def record_email_sent() -> None:
+async def record_email_sent() -> None:
     """
     Record that an email was sent (updates the timestamp).
     Should be called after successfully sending an email.
+    
+    The in-memory timestamps are updated immediately; the cooldown file is written in a
+    worker thread so the event loop is not blocked on disk I/O.
     """
-    now = datetime.now(timezone.utc)
-    _save_email_timestamp(now)
+    global _last_sent_cache, _last_local_sent_epoch, _last_sent_monotonic
+    
+    now = time.time()
+    _last_sent_cache = now
+    _last_local_sent_epoch = now
+    _last_sent_monotonic = time.monotonic()
+    await asyncio.to_thread(_save_last_email_epoch, now)
 
 
 async def _scheduled_email_task():
@@ -135,28 +214,62 @@ async def _scheduled_email_task():
     This function is called by the scheduler.
     """
     if _send_email_callback is None:
-        print("Warning: No email callback registered for scheduled task")
+        logger.warning("No email callback registered for scheduled task")
         return
     
     try:
-        print(f"Scheduled email task running at {datetime.now(timezone.utc).isoformat()}")
+        logger.info("Scheduled email task running at %s", datetime.now(timezone.utc).isoformat())
         
         # Check cooldown before sending (as a safety mechanism)
         can_send, reason = check_cooldown()
         if not can_send:
-            print(f"Scheduled email skipped due to cooldown: {reason}")
+            logger.info("Scheduled email skipped due to cooldown: %s", reason)
             return
         
         # Call the email sending callback
         await _send_email_callback()
         
-    except Exception as e:
-        print(f"Error in scheduled email task: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in scheduled email task")
+
+
+async def _run_scheduler(interval_seconds: float) -> None:
+    """
+    Run _scheduled_email_task every interval_seconds until stop_scheduler is called.
+    
+    Waits on the stop event rather than sleeping, so stopping takes effect immediately
+    between runs while a run that is already sending is allowed to finish.
+    
+    Args:
+        interval_seconds: Time between runs, in seconds
+    """
+    while True:
+        try:
+            await asyncio.wait_for(_stop_event.wait(), timeout=interval_seconds)
+            return
+        except asyncio.TimeoutError:
+            pass
+        
+        # Run outside the except block so errors logged by the task don't chain the timeout
+        await _scheduled_email_task()
 
 
-def start_scheduler(send_email_callback: Callable, interval_minutes: int = 60) -> bool:
+def _on_scheduler_done(task: asyncio.Task) -> None:
+    """
+    Clear the running flag once the scheduler task ends, however it ends.
+    
+    Also covers the task being cancelled (e.g. the loop shutting down without stop_scheduler).
+    
+    Args:
+        task: The finished scheduler task
+    """
+    global _running
+    
+    if task is _scheduler_task:
+        _running = False
+
+
+async def start_scheduler(send_email_callback: Callable, interval_minutes: int = 60) -> bool:
     """
     Start the scheduler to send emails automatically every interval_minutes.
     
@@ -167,43 +280,37 @@ def start_scheduler(send_email_callback: Callable, interval_minutes: int = 60) -
     Returns:
         True if scheduler started successfully, False otherwise
     """
-    global _scheduler, _send_email_callback
+    global _scheduler_task, _stop_event, _send_email_callback, _running
     
-    if not APSCHEDULER_AVAILABLE:
-        print("Warning: APScheduler not available. Install with: pip install apscheduler")
-        return False
-    
-    if _scheduler is not None and _scheduler.running:
-        print("Scheduler is already running")
-        return True
-    
-    _send_email_callback = send_email_callback
-    _scheduler = AsyncIOScheduler()
-    
-    # Schedule the task to run every interval_minutes
-    _scheduler.add_job(
-        _scheduled_email_task,
-        trigger=IntervalTrigger(minutes=interval_minutes),
-        id="send_options_email",
-        name="Send Options Email",
-        replace_existing=True
-    )
+    async with _scheduler_lock:
+        if _running:
+            logger.info("Scheduler is already running")
+            return True
+        
+        _send_email_callback = send_email_callback
+        _stop_event = asyncio.Event()
+        _scheduler_task = asyncio.create_task(_run_scheduler(interval_minutes * 60))
+        _scheduler_task.add_done_callback(_on_scheduler_done)
+        _running = True
     
-    _scheduler.start()
-    print(f"Scheduler started: will send emails every {interval_minutes} minutes")
+    logger.info("Scheduler started: will send emails every %s minutes", interval_minutes)
     return True
 
 
-def stop_scheduler() -> None:
+async def stop_scheduler() -> None:
     """
-    Stop the scheduler if it's running.
+    Stop the scheduler if it's running, waiting for an in-progress run to finish.
     """
-    global _scheduler
+    global _scheduler_task, _running
     
-    if _scheduler is not None and _scheduler.running:
-        _scheduler.shutdown(wait=True)
-        print("Scheduler stopped")
-        _scheduler = None
+    async with _scheduler_lock:
+        if _running:
+            _stop_event.set()
+            await _scheduler_task
+            logger.info("Scheduler stopped")
+        # Cleared here as well, since the done callback may not have run yet
+        _running = False
+        _scheduler_task = None
 
 
 def is_scheduler_running() -> bool:
@@ -213,5 +320,4 @@ def is_scheduler_running() -> bool:
     Returns:
         True if scheduler is running, False otherwise
     """
-    return _scheduler is not None and _scheduler.running
-
+    return _running
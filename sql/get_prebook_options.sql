@@ -0,0 +1,64 @@
+-- Returns every option for the org's available pre-book loads, joined with the
+-- load, origin/destination locations, carrier and a carrier contact phone.
+--
+-- Used by db.get_options_with_available_loads when USE_PREBOOK_OPTIONS_RPC=true.
+-- p_pickup_cutoff is the pre-book cutoff computed by db.get_prebook_cutoff.
+-- p_org_id is cast to the column type (not the column to text) so the loads.org_id
+-- index stays usable.
+-- Results are ordered by option id and paged with p_limit/p_offset, since PostgREST's
+-- max-rows limit also caps what a set-returning function can return in one call.
+drop function if exists get_prebook_options(text, timestamptz);
+create or replace function get_prebook_options(
+    p_org_id text,
+    p_pickup_cutoff timestamptz,
+    p_limit integer,
+    p_offset integer
+)
+returns setof jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'option', jsonb_build_object(
+            'id', o.id,
+            'load_id', o.load_id,
+            'carrier_id', o.carrier_id,
+            'status', o.status,
+            'offered_rate', o.offered_rate,
+            'created_at', o.created_at
+        ),
+        'load', jsonb_build_object(
+            'id', l.id,
+            'status', l.status,
+            'org_id', l.org_id,
+            'custom_load_id', l.custom_load_id,
+            'pickup_date_close', l.pickup_date_close,
+            'origin_location_id', l.origin_location_id,
+            'destination_location_id', l.destination_location_id
+        ),
+        'origin', case when orig.id is not null then
+            jsonb_build_object('id', orig.id, 'city', orig.city, 'state', orig.state)
+        end,
+        'destination', case when dest.id is not null then
+            jsonb_build_object('id', dest.id, 'city', dest.city, 'state', dest.state)
+        end,
+        'carrier', case when c.id is not null then
+            jsonb_build_object('id', c.id, 'name', c.name, 'mc_number', c.mc_number, 'dot_number', c.dot_number)
+        end,
+        'phone', cc.phone
+    )
+    from options o
+    join loads l on o.load_id = l.id
+    left join locations orig on l.origin_location_id = orig.id
+    left join locations dest on l.destination_location_id = dest.id
+    left join carriers c on o.carrier_id = c.id
+    left join lateral (
+        select phone from carrier_contacts where carrier_id = o.carrier_id limit 1
+    ) cc on true
+    where l.status = 'available'
+      and l.org_id = p_org_id::uuid
+      and l.pickup_date_close >= p_pickup_cutoff
+    order by o.id
+    limit p_limit
+    offset p_offset;
+$$;